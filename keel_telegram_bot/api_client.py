@@ -22,6 +22,11 @@ class KeelApiClient:
         self._port = port
         self._ssl = ssl
         self._auth = HTTPBasicAuth(user, password)
+        # reuse connections to keel across requests. The client is used by the monitor,
+        # dispatcher and inline keyboard threads concurrently. Sharing a single session is safe
+        # here, since its urllib3 connection pool is thread safe and no per request state
+        # (auth, headers, cookies) is ever stored on the session itself.
+        self._session = requests.Session()
 
         self._base_url = f"{'https' if ssl else 'http'}://{host}:{port}"
 
@@ -97,9 +102,9 @@ class KeelApiClient:
         url = self._create_request_url(url, params)
 
         if method is GET:
-            method = requests.get
+            method = self._session.get
         elif method is POST:
-            method = requests.post
+            method = self._session.post
         else:
             raise ValueError("Unsupported method: {}".format(method))
 
@@ -1,23 +1,51 @@
+import html
 import logging
 import re
-from typing import Dict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple
 
 from container_app_conf.formatter.toml import TomlFormatter
 from requests import HTTPError
 from telegram import Update, ParseMode, InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardRemove
 from telegram.ext import CommandHandler, Filters, MessageHandler, Updater, CallbackContext, CallbackQueryHandler
+from telegram_click import generate_command_list
 from telegram_click.argument import Argument, Flag
 from telegram_click.decorator import command
 
+from keel_telegram_bot import __version__
 from keel_telegram_bot.api_client import KeelApiClient
 from keel_telegram_bot.bot.permissions import CONFIG_ADMINS
 from keel_telegram_bot.bot.reply_keyboard_handler import ReplyKeyboardHandler
 from keel_telegram_bot.config import Config
 from keel_telegram_bot.stats import *
-from keel_telegram_bot.util import send_message, approval_to_str
+from keel_telegram_bot.util import send_message, approval_to_str, join_limited, format_for_single_line_log
 
 LOGGER = logging.getLogger(__name__)
 
+# matches both fields in a single pass, assuming the order used by approval_to_str
+APPROVAL_MESSAGE_PATTERN = re.compile(r"^Id: (?P<id>[^\n]*)$.*?^Identifier: (?P<identifier>[^\n]*)$",
+                                      flags=re.MULTILINE | re.DOTALL)
+APPROVAL_ID_PATTERN = re.compile(r"^Id: (.*)", flags=re.MULTILINE)
+APPROVAL_IDENTIFIER_PATTERN = re.compile(r"^Identifier: (.*)", flags=re.MULTILINE)
+
+# title, level, identifier, type, message
+NOTIFICATION_TEMPLATE = "<b>%s: %s</b>\n%s\n%s\n%s"
+
+# there are only a few distinct approval notification menus, so they are built once
+MENU_ARCHIVED = InlineKeyboardMarkup.from_column([
+    InlineKeyboardButton("Approved", callback_data=BUTTON_DATA_NOTHING),
+])
+MENU_REJECTED = InlineKeyboardMarkup.from_column([
+    InlineKeyboardButton("Rejected", callback_data=BUTTON_DATA_NOTHING),
+])
+MENU_PENDING = InlineKeyboardMarkup.from_column([
+    InlineKeyboardButton("Approve", callback_data=BUTTON_DATA_APPROVE),
+    InlineKeyboardButton("Reject", callback_data=BUTTON_DATA_REJECT),
+])
+MENU_EMPTY = InlineKeyboardMarkup.from_column([])
+
 
 class KeelTelegramBot:
     """
@@ -31,58 +59,87 @@ class KeelTelegramBot:
         """
         self._config = config
         self._api_client = api_client
-        self._message_map = {}
+        self._admin_usernames = frozenset(self._config.TELEGRAM_ADMIN_USERNAMES.value)
+        self._chat_ids = tuple(self._config.TELEGRAM_CHAT_IDS.value)
+        # (approval id, approval identifier) -> chat id -> message id -> content hash
+        self._message_map: Dict[Tuple[str, str], Dict[int, Dict[int, int]]] = {}
+        # the message map is accessed by the monitor and the dispatcher threads
+        self._message_map_lock = threading.Lock()
+        # (rejected, archived) -> (timestamp, approvals)
+        self._approvals_cache = {}
+        # incremented on invalidation, so fetches started before it are not cached
+        self._approvals_cache_generation = 0
+        self._approvals_cache_lock = threading.Lock()
+        # the config and command list do not change at runtime, so they are only rendered once
+        self._config_text = None
+        self._help_text = None
 
         self._response_handler = ReplyKeyboardHandler()
-
-        self._updater = Updater(token=self._config.TELEGRAM_BOT_TOKEN.value, use_context=True)
+        # used to fan out messages to multiple chats concurrently
+        self._send_executor = ThreadPoolExecutor(max_workers=TELEGRAM_SEND_WORKERS, thread_name_prefix="tg-fanout")
+        # notifications received within a short time window are sent as a single message
+        self._notification_lock = threading.Lock()
+        self._notification_buffer: List[str] = []
+        self._notification_timer = None
+        self._notifications_stopped = False
+        # ensures buffered notifications are sent one flush at a time, in order
+        self._notification_send_lock = threading.Lock()
+
+        self._updater = Updater(
+            token=self._config.TELEGRAM_BOT_TOKEN.value,
+            use_context=True,
+            request_kwargs={
+                # enough connections for the fan-out pool, dispatcher workers and polling
+                "con_pool_size": TELEGRAM_SEND_WORKERS + 8,
+                "read_timeout": 20,
+                "connect_timeout": 10,
+            },
+        )
         LOGGER.debug(f"Using bot id '{self._updater.bot.id}' ({self._updater.bot.name})")
         self._dispatcher = self._updater.dispatcher
 
-        handler_groups = {
-            0: [CallbackQueryHandler(callback=self._inline_keyboard_click_callback)],
-            1: [
-                CommandHandler(COMMAND_START,
-                               filters=(~ Filters.reply) & (~ Filters.forwarded),
-                               callback=self._start_callback),
-                CommandHandler(COMMAND_LIST_APPROVALS,
-                               filters=(~ Filters.reply) & (~ Filters.forwarded),
-                               callback=self._list_approvals_callback),
-                CommandHandler(COMMAND_APPROVE,
-                               filters=(~ Filters.reply) & (~ Filters.forwarded),
-                               callback=self._approve_callback),
-                CommandHandler(COMMAND_REJECT,
-                               filters=(~ Filters.reply) & (~ Filters.forwarded),
-                               callback=self._reject_callback),
-                CommandHandler(COMMAND_DELETE,
-                               filters=(~ Filters.reply) & (~ Filters.forwarded),
-                               callback=self._delete_callback),
-
-                CommandHandler(COMMAND_HELP,
-                               filters=(~ Filters.reply) & (~ Filters.forwarded),
-                               callback=self._help_callback),
-                CommandHandler(COMMAND_CONFIG,
-                               filters=(~ Filters.reply) & (~ Filters.forwarded),
-                               callback=self._config_callback),
-                CommandHandler(COMMAND_VERSION,
-                               filters=(~ Filters.reply) & (~ Filters.forwarded),
-                               callback=self._version_callback),
-                CommandHandler(CANCEL_KEYBOARD_COMMAND[1:],
-                               filters=(~ Filters.reply) & (~ Filters.forwarded),
-                               callback=self._response_handler.cancel_keyboard_callback),
-                # unknown command handler
-                MessageHandler(
-                    filters=Filters.command & (~ Filters.forwarded),
-                    callback=self._unknown_command_callback),
-                MessageHandler(
-                    filters=(~ Filters.forwarded),
-                    callback=self._any_message_callback),
-            ]
-        }
-
-        for group, handlers in handler_groups.items():
-            for handler in handlers:
-                self._updater.dispatcher.add_handler(handler, group=group)
+        no_reply_or_forward = (~ Filters.reply) & (~ Filters.forwarded)
+        handlers = [
+            (0, CallbackQueryHandler(callback=self._inline_keyboard_click_callback)),
+            (1, CommandHandler(COMMAND_START,
+                               filters=no_reply_or_forward,
+                               callback=self._start_callback)),
+            (1, CommandHandler(COMMAND_LIST_APPROVALS,
+                               filters=no_reply_or_forward,
+                               callback=self._list_approvals_callback)),
+            (1, CommandHandler(COMMAND_APPROVE,
+                               filters=no_reply_or_forward,
+                               callback=self._approve_callback)),
+            (1, CommandHandler(COMMAND_REJECT,
+                               filters=no_reply_or_forward,
+                               callback=self._reject_callback)),
+            (1, CommandHandler(COMMAND_DELETE,
+                               filters=no_reply_or_forward,
+                               callback=self._delete_callback)),
+
+            (1, CommandHandler(COMMAND_HELP,
+                               filters=no_reply_or_forward,
+                               callback=self._help_callback)),
+            (1, CommandHandler(COMMAND_CONFIG,
+                               filters=no_reply_or_forward,
+                               callback=self._config_callback)),
+            (1, CommandHandler(COMMAND_VERSION,
+                               filters=no_reply_or_forward,
+                               callback=self._version_callback)),
+            (1, CommandHandler(CANCEL_KEYBOARD_COMMAND[1:],
+                               filters=no_reply_or_forward,
+                               callback=self._response_handler.cancel_keyboard_callback)),
+            # unknown command handler
+            (1, MessageHandler(
+                filters=Filters.command & (~ Filters.forwarded),
+                callback=self._unknown_command_callback)),
+            (1, MessageHandler(
+                filters=(~ Filters.forwarded),
+                callback=self._any_message_callback)),
+        ]
+
+        for group, handler in handlers:
+            self._updater.dispatcher.add_handler(handler, group=group)
 
     @property
     def bot(self):
@@ -92,13 +149,25 @@ class KeelTelegramBot:
         """
         Starts up the bot.
         """
-        self._updater.start_polling()
+        # use long polling to avoid frequent requests while idle
+        # and only fetch the update types handled by this bot
+        self._updater.start_polling(
+            poll_interval=0.0,
+            timeout=50,
+            read_latency=2.0,
+            bootstrap_retries=-1,
+            allowed_updates=["message", "callback_query"],
+        )
 
     def stop(self):
         """
         Shuts down the bot.
         """
         self._updater.stop()
+        with self._notification_lock:
+            self._notifications_stopped = True
+        self._flush_notifications()
+        self._send_executor.shutdown(wait=True)
 
     @COMMAND_TIME_START.time()
     def _start_callback(self, update: Update, context: CallbackContext) -> None:
@@ -136,42 +205,46 @@ class KeelTelegramBot:
         message = update.effective_message
         chat_id = update.effective_chat.id
 
-        items = self._api_client.get_approvals()
-
-        rejected_items = list(filter(lambda x: x[KEY_REJECTED], items))
-        archived_items = list(filter(lambda x: x[KEY_ARCHIVED], items))
-        pending_items = list(filter(
-            lambda x: x not in archived_items and x not in rejected_items
-                      and x[KEY_VOTES_RECEIVED] < x[KEY_VOTES_REQUIRED], items))
-        approved_items = list(
-            filter(lambda x: x not in rejected_items and x not in archived_items and x not in pending_items, items))
+        items = self._get_approvals_cached()
+
+        # sort items into disjoint categories in a single pass
+        archived_items, rejected_items, pending_items, approved_items = [], [], [], []
+        for x in items:
+            if x[KEY_ARCHIVED]:
+                archived_items.append(x)
+            elif x[KEY_REJECTED]:
+                rejected_items.append(x)
+            elif x[KEY_VOTES_RECEIVED] < x[KEY_VOTES_REQUIRED]:
+                pending_items.append(x)
+            else:
+                approved_items.append(x)
 
         lines = []
         if archived:
             lines.append("\n".join([
                 f"<b>=== Archived ({len(archived_items)}) ===</b>",
                 "",
-                "\n\n".join(list(map(lambda x: "> " + approval_to_str(x), archived_items)))
+                "\n\n".join(["> " + approval_to_str(x) for x in archived_items])
             ]).strip())
 
         if approved:
             lines.append("\n".join([
                 f"<b>=== Approved ({len(approved_items)}) ===</b>",
                 "",
-                "\n\n".join(list(map(lambda x: "> " + approval_to_str(x), approved_items))),
+                "\n\n".join(["> " + approval_to_str(x) for x in approved_items]),
             ]).strip())
 
         if rejected:
             lines.append("\n".join([
                 f"<b>=== Rejected ({len(rejected_items)}) ===</b>",
                 "",
-                "\n\n".join(list(map(lambda x: "> " + approval_to_str(x), rejected_items))),
+                "\n\n".join(["> " + approval_to_str(x) for x in rejected_items]),
             ]).strip())
 
         lines.append("\n".join([
             f"<b>=== Pending ({len(pending_items)}) ===</b>",
             "",
-            "\n\n".join(list(map(lambda x: "> " + approval_to_str(x), pending_items))),
+            "\n\n".join(["> " + approval_to_str(x) for x in pending_items]),
         ]))
 
         text = "\n\n".join(lines).strip()
@@ -200,20 +273,22 @@ class KeelTelegramBot:
             chat_id = update.effective_chat.id
 
             self._api_client.approve(item["id"], item["identifier"], voter)
+            self._invalidate_approvals_cache()
             text = f"Approved {item['identifier']}"
             send_message(bot, chat_id, text, reply_to=message.message_id, menu=ReplyKeyboardRemove(selective=True))
 
-        items = self._api_client.get_approvals(rejected=False, archived=False)
+        items = self._get_approvals_cached(rejected=False, archived=False)
 
         # compare to the "id" first
-        exact_matches = list(filter(lambda x: x["id"] == identifier, items))
-        if len(exact_matches) > 0:
-            execute(update, context, exact_matches[0], {})
+        exact_match = next((x for x in items if x["id"] == identifier), None)
+        if exact_match is not None:
+            execute(update, context, exact_match, {})
             return
 
         # then fuzzy match to "identifier"
         self._response_handler.await_user_selection(
-            update, context, identifier, choices=items, key=lambda x: x["identifier"],
+            update, context, identifier, choices=self._prefilter_by_identifier(items, identifier),
+            key=lambda x: x["identifier"],
             callback=execute,
         )
 
@@ -242,20 +317,22 @@ class KeelTelegramBot:
             chat_id = update.effective_chat.id
 
             self._api_client.reject(item["id"], item["identifier"], voter)
+            self._invalidate_approvals_cache()
             text = f"Rejected {item['identifier']}"
             send_message(bot, chat_id, text, reply_to=message.message_id, menu=ReplyKeyboardRemove(selective=True))
 
-        items = self._api_client.get_approvals(rejected=False, archived=False)
+        items = self._get_approvals_cached(rejected=False, archived=False)
 
         # compare to the "id" first
-        exact_matches = list(filter(lambda x: x["id"] == identifier, items))
-        if len(exact_matches) > 0:
-            execute(update, context, exact_matches[0], {})
+        exact_match = next((x for x in items if x["id"] == identifier), None)
+        if exact_match is not None:
+            execute(update, context, exact_match, {})
             return
 
         # then fuzzy match to "identifier"
         self._response_handler.await_user_selection(
-            update, context, identifier, choices=items, key=lambda x: x["identifier"],
+            update, context, identifier, choices=self._prefilter_by_identifier(items, identifier),
+            key=lambda x: x["identifier"],
             callback=execute,
         )
 
@@ -282,26 +359,30 @@ class KeelTelegramBot:
             chat_id = update.effective_chat.id
 
             self._api_client.delete(item["id"], item["identifier"], voter)
+            self._invalidate_approvals_cache()
             text = f"Deleted {item['identifier']}"
             send_message(bot, chat_id, text, reply_to=message.message_id, menu=ReplyKeyboardRemove(selective=True))
 
-        items = self._api_client.get_approvals()
+        items = self._get_approvals_cached()
 
         # compare to the "id" first
-        exact_matches = list(filter(lambda x: x["id"] == identifier, items))
-        if len(exact_matches) > 0:
-            execute(update, context, exact_matches[0], {})
+        exact_match = next((x for x in items if x["id"] == identifier), None)
+        if exact_match is not None:
+            execute(update, context, exact_match, {})
             return
 
         # then fuzzy match to "identifier"
         self._response_handler.await_user_selection(
-            update, context, identifier, choices=items, key=lambda x: x["identifier"],
+            update, context, identifier, choices=self._prefilter_by_identifier(items, identifier),
+            key=lambda x: x["identifier"],
             callback=execute,
         )
 
     def on_notification(self, data: dict):
         """
-        Handles incoming notifications (via Webhook)
+        Handles incoming notifications (via Webhook).
+        Notifications are buffered for up to NOTIFICATION_BATCH_DELAY seconds
+        and then sent to all configured chat ids combined.
         :param data: notification data
         """
         KEEL_NOTIFICATION_COUNTER.inc()
@@ -312,19 +393,52 @@ class KeelTelegramBot:
         level = data.get("level", None)  # success/failure
         message = data.get("message", None)
 
-        text = "\n".join([
-            f"<b>{title}: {level}</b>",
-            f"{identifier}",
-            f"{type}",
-            f"{message}",
-        ])
+        # keel supplied values must not be interpreted as HTML
+        text = NOTIFICATION_TEMPLATE % tuple(
+            html.escape(str(x), quote=False) for x in (title, level, identifier, type, message))
 
-        for chat_id in self._config.TELEGRAM_CHAT_IDS.value:
-            send_message(
-                self.bot, chat_id,
-                text, parse_mode=ParseMode.HTML,
-                menu=None
-            )
+        flush_now = False
+        with self._notification_lock:
+            if self._notifications_stopped:
+                LOGGER.warning(f"Bot is stopped, dropping notification: {format_for_single_line_log(text)}")
+                return
+            self._notification_buffer.append(text)
+            if len(self._notification_buffer) >= NOTIFICATION_BATCH_MAX_SIZE:
+                flush_now = True
+            elif self._notification_timer is None:
+                # the timer is not re-armed by following notifications to bound the delay
+                self._notification_timer = threading.Timer(NOTIFICATION_BATCH_DELAY, self._flush_notifications)
+                self._notification_timer.start()
+
+        if flush_now:
+            self._flush_notifications()
+
+    def _flush_notifications(self):
+        """
+        Sends all buffered notifications to all configured chat ids
+        """
+        with self._notification_send_lock:
+            with self._notification_lock:
+                if self._notification_timer is not None:
+                    self._notification_timer.cancel()
+                    self._notification_timer = None
+                texts = self._notification_buffer
+                self._notification_buffer = []
+
+            for text in join_limited(texts, separator="\n\n", limit=TELEGRAM_MESSAGE_LENGTH_LIMIT):
+                futures = [
+                    self._send_executor.submit(
+                        send_message,
+                        self.bot, chat_id,
+                        text, parse_mode=ParseMode.HTML,
+                        menu=None
+                    ) for chat_id in self._chat_ids
+                ]
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as ex:
+                        LOGGER.exception(ex)
 
     def on_new_pending_approval(self, item: dict):
         """
@@ -335,14 +449,19 @@ class KeelTelegramBot:
         text = approval_to_str(item)
         menu = self.create_approval_notification_menu(item)
 
-        for chat_id in self._config.TELEGRAM_CHAT_IDS.value:
+        futures = [
+            self._send_executor.submit(
+                send_message,
+                self.bot, chat_id,
+                text, parse_mode=ParseMode.HTML,
+                menu=menu
+            ) for chat_id in self._chat_ids
+        ]
+        for future in as_completed(futures):
             try:
-                response = send_message(
-                    self.bot, chat_id,
-                    text, parse_mode=ParseMode.HTML,
-                    menu=menu
-                )
-                self._register_message(response.chat_id, response.message_id, item["id"], item["identifier"])
+                response = future.result()
+                self._register_message(response.chat_id, response.message_id, item["id"], item["identifier"],
+                                       self._message_content_hash(text, menu))
             except Exception as ex:
                 LOGGER.exception(ex)
 
@@ -355,8 +474,9 @@ class KeelTelegramBot:
         bot = context.bot
         message = update.effective_message
         chat_id = update.effective_chat.id
-        text = self._config.print(TomlFormatter())
-        send_message(bot, chat_id, text, reply_to=message.message_id)
+        if self._config_text is None:
+            self._config_text = self._config.print(TomlFormatter())
+        send_message(bot, chat_id, self._config_text, reply_to=message.message_id)
 
     @command(
         name=COMMAND_HELP,
@@ -368,9 +488,11 @@ class KeelTelegramBot:
         message = update.effective_message
         chat_id = update.effective_chat.id
 
-        from telegram_click import generate_command_list
-        text = generate_command_list(update, context)
-        send_message(bot, chat_id, text,
+        # every command requires CONFIG_ADMINS, the only users who
+        # can see this list, so it is the same for all of them
+        if self._help_text is None:
+            self._help_text = generate_command_list(update, context)
+        send_message(bot, chat_id, self._help_text,
                      parse_mode=ParseMode.MARKDOWN,
                      reply_to=message.message_id)
 
@@ -384,7 +506,6 @@ class KeelTelegramBot:
         message = update.effective_message
         chat_id = update.effective_chat.id
 
-        from keel_telegram_bot import __version__
         text = __version__
         send_message(bot, chat_id, text, reply_to=message.message_id)
 
@@ -399,7 +520,7 @@ class KeelTelegramBot:
         if update.effective_user is not None:
             username = update.effective_user.username
 
-        user_is_admin = username in self._config.TELEGRAM_ADMIN_USERNAMES.value
+        user_is_admin = username in self._admin_usernames
         if user_is_admin:
             self._help_callback(update, context)
             return
@@ -412,28 +533,90 @@ class KeelTelegramBot:
         """
         self._response_handler.on_message(update, context)
 
+    def _get_approvals_cached(self, rejected: bool = None, archived: bool = None) -> List[dict]:
+        """
+        Fetches approvals from keel, reusing the result of a previous call
+        with the same arguments if it is younger than APPROVALS_CACHE_TTL seconds
+        :param rejected: True for rejected, False for approved, None for all
+        :param archived: True for archived, False for not archived, None for all
+        :return: a list of all approvals matching criteria
+        """
+        key = (rejected, archived)
+        with self._approvals_cache_lock:
+            now = time.monotonic()
+            cached = self._approvals_cache.get(key, None)
+            if cached is not None and now - cached[0] < APPROVALS_CACHE_TTL:
+                return cached[1]
+            generation = self._approvals_cache_generation
+
+        approvals = self._api_client.get_approvals(rejected=rejected, archived=archived)
+
+        with self._approvals_cache_lock:
+            # the result may already be outdated, if the cache was invalidated while fetching
+            if generation == self._approvals_cache_generation:
+                self._approvals_cache[key] = (now, approvals)
+        return approvals
+
+    @staticmethod
+    def _prefilter_by_identifier(items: List[dict], identifier: str) -> List[dict]:
+        """
+        Narrows down the candidates for fuzzy matching to items whose identifier
+        contains the given term (ignoring case). This is only done if there are enough
+        of them to fill all suggestions, so close matches without a substring hit
+        are not dropped from the selection keyboard.
+        :param items: approvals to filter
+        :param identifier: the search term
+        :return: all matching items, or all items if there are too few
+        """
+        term = identifier.casefold()
+        candidates = [x for x in items if x["identifier"] is not None and term in x["identifier"].casefold()]
+        return candidates if len(candidates) >= SELECTION_SUGGESTION_LIMIT else items
+
+    def _invalidate_approvals_cache(self):
+        """
+        Drops all cached approvals, f.ex. after an approval has been modified
+        """
+        with self._approvals_cache_lock:
+            self._approvals_cache_generation += 1
+            self._approvals_cache.clear()
+
+    @staticmethod
+    def _parse_approval_message(message_text: str) -> Tuple[str, str]:
+        """
+        Extracts the approval id and identifier from an approval notification message
+        :param message_text: text of the message, as created by approval_to_str
+        :return: (approval id, approval identifier)
+        """
+        matches = APPROVAL_MESSAGE_PATTERN.search(message_text)
+        if matches is not None:
+            return matches.group("id", "identifier")
+
+        # fall back to order independent matching
+        approval_id = APPROVAL_ID_PATTERN.search(message_text).group(1)
+        approval_identifier = APPROVAL_IDENTIFIER_PATTERN.search(message_text).group(1)
+        return approval_id, approval_identifier
+
     def _inline_keyboard_click_callback(self, update: Update, context: CallbackContext):
         """
         Handles inline keyboard button click callbacks
         :param update:
         :param context:
         """
-        bot = context.bot
-        from_user = update.callback_query.from_user
-
-        message_text = update.effective_message.text
         query = update.callback_query
-        query_id = query.id
         data = query.data
 
         if data == BUTTON_DATA_NOTHING:
+            # stop the loading indicator on the client
+            query.answer()
             return
 
+        bot = context.bot
+        from_user = query.from_user
+        message_text = update.effective_message.text
+        query_id = query.id
+
         try:
-            matches = re.search(r"^Id: (.*)", message_text, flags=re.MULTILINE)
-            approval_id = matches.group(1)
-            matches = re.search(r"^Identifier: (.*)", message_text, flags=re.MULTILINE)
-            approval_identifier = matches.group(1)
+            approval_id, approval_identifier = self._parse_approval_message(message_text)
 
             if data == BUTTON_DATA_APPROVE:
                 self._api_client.approve(approval_id, approval_identifier, from_user.full_name)
@@ -447,6 +630,7 @@ class KeelTelegramBot:
                 bot.answer_callback_query(query_id, text="Unknown button")
                 return
 
+            self._invalidate_approvals_cache()
             context.bot.answer_callback_query(query_id, text=answer_text)
             self.update_messages()
         except HTTPError as e:
@@ -457,29 +641,33 @@ class KeelTelegramBot:
             bot.answer_callback_query(query_id, text=f"Unknwon error")
 
     @staticmethod
-    def _build_inline_keyboard(items: Dict[str, str]) -> InlineKeyboardMarkup:
+    def create_approval_notification_menu(item: dict) -> InlineKeyboardMarkup:
         """
-        Builds an inline button menu
-        :param items: dictionary of "button text" -> "callback data" items
+        Selects the inline button menu matching the state of an approval
+        :param item: approval
         :return: reply markup
         """
-        keyboard = list(map(lambda x: InlineKeyboardButton(x[0], callback_data=x[1]), items.items()))
-        return InlineKeyboardMarkup.from_column(keyboard)
-
-    def create_approval_notification_menu(self, item: dict) -> InlineKeyboardMarkup:
-        keyboard_items = {}
-        if item["archived"]:
-            keyboard_items["Approved"] = BUTTON_DATA_NOTHING
-        elif item["rejected"]:
-            keyboard_items["Rejected"] = BUTTON_DATA_NOTHING
+        if item[KEY_ARCHIVED]:
+            return MENU_ARCHIVED
+        elif item[KEY_REJECTED]:
+            return MENU_REJECTED
+        elif item[KEY_VOTES_REQUIRED] > item[KEY_VOTES_RECEIVED]:
+            return MENU_PENDING
         else:
-            if item["votesRequired"] > item["votesReceived"]:
-                keyboard_items["Approve"] = BUTTON_DATA_APPROVE
-                keyboard_items["Reject"] = BUTTON_DATA_REJECT
+            return MENU_EMPTY
 
-        return self._build_inline_keyboard(keyboard_items)
+    @staticmethod
+    def _message_content_hash(text: str, menu: InlineKeyboardMarkup) -> int:
+        """
+        Computes a hash over the rendered content of an approval notification message
+        :param text: message text
+        :param menu: inline keyboard menu of the message, one of the prebuilt MENU_* constants
+        :return: hash value
+        """
+        return hash((text, id(menu)))
 
-    def _register_message(self, chat_id: int, message_id: int, approval_id: str, approval_identifier: str):
+    def _register_message(self, chat_id: int, message_id: int, approval_id: str, approval_identifier: str,
+                          content_hash: int):
         """
         Registers a telegram message, that corresponds with an approval notification.
         This is used to update this message. This is possible for approx. 48 hours, after
@@ -488,38 +676,76 @@ class KeelTelegramBot:
         :param message_id: message id
         :param approval_id: approval id
         :param approval_identifier: approval identifier
+        :param content_hash: hash of the content the message was sent with
         """
-        key = f"{approval_id}_{approval_identifier}"
-        self._message_map.setdefault(key, {}).setdefault(chat_id, set()).add(message_id)
+        key = (approval_id, approval_identifier)
+        with self._message_map_lock:
+            self._message_map.setdefault(key, {}).setdefault(chat_id, {})[message_id] = content_hash
 
     def update_messages(self):
         """
-        Fetch approvals and update existing approval messages accordingly
+        Fetch approvals and update existing approval messages accordingly.
+        Messages are only edited, if their rendered content has changed.
         """
-        approvals = self._api_client.get_approvals()
+        approvals = self._get_approvals_cached()
 
         for approval in approvals:
             approval_id = approval["id"]
             approval_identifier = approval["identifier"]
-            key = f"{approval_id}_{approval_identifier}"
-
-            chats = self._message_map.get(key, {})
-            failed_messages = set()
-            for chat_id, message_ids in chats.items():
-                for message_id in message_ids:
-                    try:
-                        approval_str = approval_to_str(approval)
-                        menu = self.create_approval_notification_menu(approval)
-                        self.bot.edit_message_text(
-                            approval_str,
-                            chat_id=chat_id,
-                            message_id=message_id,
-                            parse_mode=ParseMode.HTML,
-                            reply_markup=menu
-                        )
-                    except Exception as ex:
-                        failed_messages.add(message_id)
-                        LOGGER.exception(ex)
-
-                for failure in failed_messages:
-                    message_ids.remove(failure)
+            key = (approval_id, approval_identifier)
+
+            with self._message_map_lock:
+                if len(self._message_map.get(key, {})) <= 0:
+                    continue
+
+            approval_str = approval_to_str(approval)
+            menu = self.create_approval_notification_menu(approval)
+            content_hash = self._message_content_hash(approval_str, menu)
+
+            with self._message_map_lock:
+                outdated_messages = [
+                    (chat_id, message_id)
+                    for chat_id, message_ids in self._message_map.get(key, {}).items()
+                    for message_id, last_content_hash in message_ids.items()
+                    if last_content_hash != content_hash
+                ]
+
+            futures = {
+                self._send_executor.submit(
+                    self.bot.edit_message_text,
+                    approval_str,
+                    chat_id=chat_id,
+                    message_id=message_id,
+                    parse_mode=ParseMode.HTML,
+                    reply_markup=menu
+                ): (chat_id, message_id) for chat_id, message_id in outdated_messages
+            }
+
+            updated_messages = []
+            failed_messages = []
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    updated_messages.append(futures[future])
+                except Exception as ex:
+                    failed_messages.append(futures[future])
+                    LOGGER.exception(ex)
+
+            # the map may have been modified by another thread while the edits were running
+            with self._message_map_lock:
+                chats = self._message_map.get(key, {})
+                for chat_id, message_id in updated_messages:
+                    message_ids = chats.get(chat_id)
+                    if message_ids is not None and message_id in message_ids:
+                        message_ids[message_id] = content_hash
+
+                # stop tracking messages that can not be edited anymore
+                for chat_id, message_id in failed_messages:
+                    message_ids = chats.get(chat_id)
+                    if message_ids is None:
+                        continue
+                    message_ids.pop(message_id, None)
+                    if len(message_ids) <= 0:
+                        chats.pop(chat_id)
+                if len(chats) <= 0:
+                    self._message_map.pop(key, None)
@@ -4,7 +4,7 @@ from typing import List, Any
 from telegram import Update, ParseMode, ReplyKeyboardRemove, ReplyKeyboardMarkup, KeyboardButton
 from telegram.ext import CallbackContext
 
-from keel_telegram_bot.const import CANCEL_KEYBOARD_COMMAND
+from keel_telegram_bot.const import CANCEL_KEYBOARD_COMMAND, SELECTION_SUGGESTION_LIMIT
 from keel_telegram_bot.util import send_message, fuzzy_match
 
 LOGGER = logging.getLogger(__name__)
@@ -65,7 +65,7 @@ class ReplyKeyboardHandler:
         message_id = update.effective_message.message_id
         user_id = update.effective_user.id
 
-        fuzzy_matches = fuzzy_match(selection, choices=choices, key=key, limit=5)
+        fuzzy_matches = fuzzy_match(selection, choices=choices, key=key, limit=SELECTION_SUGGESTION_LIMIT)
 
         # check if something matches perfectly
         perfect_matches = list(filter(lambda x: x[1] == 100, fuzzy_matches))
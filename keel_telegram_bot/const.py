@@ -1,5 +1,17 @@
 REQUESTS_TIMEOUT = (5, 5)
 TELEGRAM_CAPTION_LENGTH_LIMIT = 200
+TELEGRAM_MESSAGE_LENGTH_LIMIT = 4096
+
+# time in seconds for which fetched approvals are reused
+APPROVALS_CACHE_TTL = 1
+# max number of concurrent requests when sending to multiple chats
+TELEGRAM_SEND_WORKERS = 8
+# time in seconds to collect notifications before sending them
+NOTIFICATION_BATCH_DELAY = 0.5
+# max number of notifications to collect before sending them right away
+NOTIFICATION_BATCH_MAX_SIZE = 20
+# max number of suggestions shown when selecting an item
+SELECTION_SUGGESTION_LIMIT = 5
 
 # Commands
 COMMAND_START = "start"
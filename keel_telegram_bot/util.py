@@ -8,6 +8,7 @@ import iso8601
 from telegram import Bot, Message, ReplyMarkup
 
 from keel_telegram_bot.config import Config
+from keel_telegram_bot.const import KEY_ARCHIVED, KEY_REJECTED, KEY_VOTES_REQUIRED, KEY_VOTES_RECEIVED
 
 LOGGER = logging.getLogger(__name__)
 
@@ -51,6 +52,30 @@ def send_message(bot: Bot, chat_id: str, message: str, parse_mode: str = None, r
                             reply_markup=menu)
 
 
+def join_limited(texts: List[str], separator: str, limit: int) -> List[str]:
+    """
+    Joins texts into as few chunks as possible, each not exceeding the given length.
+    A single text longer than the limit is returned as its own chunk.
+    :param texts: texts to join
+    :param separator: separator between texts within a chunk
+    :param limit: maximum length of a chunk
+    :return: list of chunks
+    """
+    chunks = []
+    current = None
+    for text in texts:
+        if current is None:
+            current = text
+        elif len(current) + len(separator) + len(text) <= limit:
+            current += separator + text
+        else:
+            chunks.append(current)
+            current = text
+    if current is not None:
+        chunks.append(current)
+    return chunks
+
+
 def fuzzy_match(term: str, choices: List[Any], limit: int = None, key=lambda x: x, ignorecase: bool = True) -> List[
     Tuple[Any, int]]:
     """
@@ -98,12 +123,19 @@ def filter_new_by_key(a: List, b: List, key: callable) -> List:
 
 
 def approval_to_str(data: dict) -> str:
+    """
+    Formats an approval for a telegram message.
+    The remaining time until the deadline is only shown for undecided approvals,
+    so the text of decided approvals does not change over time.
+    :param data: approval
+    :return: formatted text
+    """
     id = data["id"]
     identifier = data["identifier"]
     current_version = data["currentVersion"]
     new_version = data["newVersion"]
-    votes_required = data["votesRequired"]
-    votes_received = data["votesReceived"]
+    votes_required = data[KEY_VOTES_REQUIRED]
+    votes_received = data[KEY_VOTES_RECEIVED]
     deadline = iso8601.parse_date(data["deadline"])
     message = data["message"]
 
@@ -111,7 +143,11 @@ def approval_to_str(data: dict) -> str:
     deadline_diff = timedelta(seconds=(deadline.replace(microsecond=0) - now_utc).total_seconds())
 
     deadline_abs_str = deadline.strftime('%m/%d %H:%M:%S')
-    deadline_remaining_str = deadline_diff_to_str(deadline_diff)
+    decided = data.get(KEY_ARCHIVED, False) or data.get(KEY_REJECTED, False) or votes_received >= votes_required
+    if decided:
+        expires_str = deadline_abs_str
+    else:
+        expires_str = f"{deadline_abs_str} ({deadline_diff_to_str(deadline_diff)})"
 
     text = "\n".join([
         f"<b>{message}</b>",
@@ -119,7 +155,7 @@ def approval_to_str(data: dict) -> str:
         f"Identifier: {identifier}",
         f"Version: {current_version} -> {new_version}",
         f"Votes: {votes_received}/{votes_required}",
-        f"Expires: {deadline_abs_str} ({deadline_remaining_str})"
+        f"Expires: {expires_str}"
     ])
 
     return text
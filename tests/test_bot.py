@@ -0,0 +1,195 @@
+import unittest
+from unittest import mock
+
+from keel_telegram_bot.api_client import KeelApiClient
+from keel_telegram_bot.bot import KeelTelegramBot, MENU_ARCHIVED, MENU_REJECTED, MENU_PENDING, MENU_EMPTY
+from keel_telegram_bot.config import Config
+from keel_telegram_bot.const import SELECTION_SUGGESTION_LIMIT, APPROVALS_CACHE_TTL
+from keel_telegram_bot.util import approval_to_str
+
+
+def _approval(identifier: str or None) -> dict:
+    return {"id": identifier, "identifier": identifier}
+
+
+def _approval_state(archived: bool, rejected: bool, votes_received: int, votes_required: int) -> dict:
+    return {
+        "archived": archived,
+        "rejected": rejected,
+        "votesReceived": votes_received,
+        "votesRequired": votes_required,
+    }
+
+
+def _full_approval(archived: bool) -> dict:
+    return {
+        "id": "48d6da3e-e4c9-4d12-8562-b7975e805d80",
+        "identifier": "deployment/local-path-storage/local-path-provisioner:v0.0.19",
+        "currentVersion": "v0.0.17",
+        "newVersion": "v0.0.19",
+        "votesRequired": 1,
+        "votesReceived": 1 if archived else 0,
+        "deadline": "2020-12-18 23:16:14.811933+00:00",
+        "message": "New image is available for resource local-path-storage/local-path-provisioner.",
+        "archived": archived,
+        "rejected": False,
+    }
+
+
+def _create_bot(api_client: KeelApiClient) -> KeelTelegramBot:
+    """
+    Creates a bot instance, that does not talk to telegram
+    """
+    with mock.patch("keel_telegram_bot.bot.Updater"):
+        return KeelTelegramBot(Config(), api_client)
+
+
+class BotTest(unittest.TestCase):
+
+    def test_prefilter_substring_match(self):
+        matching = [_approval(f"default/nginx:1.{i}") for i in range(SELECTION_SUGGESTION_LIMIT)]
+        other = _approval("default/redis:6.0")
+
+        result = KeelTelegramBot._prefilter_by_identifier(matching + [other], "nginx")
+
+        self.assertEqual(matching, result)
+
+    def test_prefilter_ignores_case(self):
+        matching = [_approval(f"default/NGINX:1.{i}") for i in range(SELECTION_SUGGESTION_LIMIT)]
+        other = _approval("default/redis:6.0")
+
+        result = KeelTelegramBot._prefilter_by_identifier(matching + [other], "Nginx")
+
+        self.assertEqual(matching, result)
+
+    def test_prefilter_skips_missing_identifier(self):
+        matching = [_approval(f"default/nginx:1.{i}") for i in range(SELECTION_SUGGESTION_LIMIT)]
+        missing = _approval(None)
+
+        result = KeelTelegramBot._prefilter_by_identifier([missing] + matching, "nginx")
+
+        self.assertEqual(matching, result)
+
+    def test_prefilter_falls_back_to_all_items(self):
+        items = [
+            _approval("default/nginx:1.21"),
+            _approval("default/nginx-proxy:1.2"),
+            _approval(None),
+        ]
+
+        self.assertEqual(items, KeelTelegramBot._prefilter_by_identifier(items, "nginx:1.2"))
+        self.assertEqual(items, KeelTelegramBot._prefilter_by_identifier(items, "postgres"))
+
+    def test_approval_notification_menu(self):
+        create_menu = KeelTelegramBot.create_approval_notification_menu
+
+        self.assertIs(MENU_ARCHIVED, create_menu(_approval_state(True, False, 1, 1)))
+        self.assertIs(MENU_ARCHIVED, create_menu(_approval_state(True, True, 0, 1)))
+        self.assertIs(MENU_REJECTED, create_menu(_approval_state(False, True, 0, 1)))
+        self.assertIs(MENU_PENDING, create_menu(_approval_state(False, False, 0, 1)))
+        self.assertIs(MENU_EMPTY, create_menu(_approval_state(False, False, 1, 1)))
+
+    def test_parse_approval_message(self):
+        approval = _full_approval(archived=False)
+
+        result = KeelTelegramBot._parse_approval_message(approval_to_str(approval))
+
+        self.assertEqual((approval["id"], approval["identifier"]), result)
+
+    def test_parse_approval_message_in_any_order(self):
+        text = "\n".join([
+            "<b>New image available</b>",
+            "Identifier: default/myimage:1.5.5",
+            "Id: 48d6da3e-e4c9-4d12-8562-b7975e805d80",
+        ])
+
+        result = KeelTelegramBot._parse_approval_message(text)
+
+        self.assertEqual(("48d6da3e-e4c9-4d12-8562-b7975e805d80", "default/myimage:1.5.5"), result)
+
+
+
+class BotMessageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.api_client = mock.create_autospec(KeelApiClient, instance=True)
+        self.bot = _create_bot(self.api_client)
+        self.telegram_bot = self.bot.bot
+        self.telegram_bot.send_message.return_value = mock.Mock(chat_id=12345678, message_id=1)
+
+    def tearDown(self):
+        self.bot.stop()
+
+    def test_unchanged_decided_approval_is_not_edited(self):
+        approval = _full_approval(archived=True)
+        self.bot.on_new_pending_approval(approval)
+        self.api_client.get_approvals.return_value = [approval]
+
+        self.bot.update_messages()
+        self.bot._invalidate_approvals_cache()
+        self.bot.update_messages()
+
+        self.telegram_bot.edit_message_text.assert_not_called()
+
+    def test_changed_approval_is_edited(self):
+        self.bot.on_new_pending_approval(_full_approval(archived=False))
+        self.api_client.get_approvals.return_value = [_full_approval(archived=True)]
+
+        self.bot.update_messages()
+
+        self.telegram_bot.edit_message_text.assert_called_once()
+
+
+class ApprovalsCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.api_client = mock.create_autospec(KeelApiClient, instance=True)
+        self.api_client.get_approvals.return_value = [_full_approval(archived=False)]
+        self.bot = _create_bot(self.api_client)
+
+    def tearDown(self):
+        self.bot.stop()
+
+    def test_cache_hit_within_ttl(self):
+        first = self.bot._get_approvals_cached(rejected=False, archived=False)
+        second = self.bot._get_approvals_cached(rejected=False, archived=False)
+
+        self.assertIs(first, second)
+        self.api_client.get_approvals.assert_called_once_with(rejected=False, archived=False)
+
+    def test_cache_is_keyed_by_arguments(self):
+        self.bot._get_approvals_cached(rejected=False, archived=False)
+        self.bot._get_approvals_cached()
+
+        self.assertEqual(2, self.api_client.get_approvals.call_count)
+
+    def test_cache_expires_after_ttl(self):
+        with mock.patch("keel_telegram_bot.bot.time") as time_mock:
+            time_mock.monotonic.side_effect = [0, APPROVALS_CACHE_TTL]
+            self.bot._get_approvals_cached()
+            self.bot._get_approvals_cached()
+
+        self.assertEqual(2, self.api_client.get_approvals.call_count)
+
+    def test_invalidation_forces_refetch(self):
+        self.bot._get_approvals_cached()
+        self.bot._invalidate_approvals_cache()
+        self.bot._get_approvals_cached()
+
+        self.assertEqual(2, self.api_client.get_approvals.call_count)
+
+    def test_fetch_running_during_invalidation_is_not_cached(self):
+        stale = [_full_approval(archived=False)]
+        fresh = [_full_approval(archived=True)]
+        responses = [stale, fresh]
+
+        def get_approvals(**kwargs):
+            if len(responses) == 2:
+                # f.ex. an approval action finishes while this fetch is running
+                self.bot._invalidate_approvals_cache()
+            return responses.pop(0)
+
+        self.api_client.get_approvals.side_effect = get_approvals
+
+        self.assertIs(stale, self.bot._get_approvals_cached())
+        self.assertIs(fresh, self.bot._get_approvals_cached())
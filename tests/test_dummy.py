@@ -1,6 +1,6 @@
 import unittest
 
-from keel_telegram_bot.util import approval_to_str
+from keel_telegram_bot.util import approval_to_str, join_limited
 
 
 class DummyTest(unittest.TestCase):
@@ -22,3 +22,11 @@ class DummyTest(unittest.TestCase):
 
         result = approval_to_str(approval)
         print(result)
+
+    def test_join_limited(self):
+        texts = ["a" * 4, "b" * 4, "c" * 4, "d" * 20]
+
+        result = join_limited(texts, separator="\n", limit=10)
+
+        self.assertEqual(["aaaa\nbbbb", "cccc", "d" * 20], result)
+        self.assertEqual([], join_limited([], separator="\n", limit=10))